@@ -0,0 +1,26 @@
+"""Setuptools shim for the optional compiled build of hot-path modules.
+
+Metadata lives in ``pyproject.toml``. With ``CYTHONIZE=1`` (and Cython
+installed, e.g. ``CYTHONIZE=1 pip install --no-build-isolation .``) the
+validator is compiled in Cython's pure-Python mode; the ``.py`` source is
+still shipped and used wherever the extension is not built.
+"""
+
+from __future__ import annotations
+
+import os
+
+from setuptools import Extension, setup
+
+ext_modules = []
+if os.getenv("CYTHONIZE", "0") == "1":
+    from Cython.Build import cythonize
+
+    # Name the extension explicitly: src/ has no __init__.py, so Cython would
+    # otherwise call it "core.validator" and ship it as a stray package.
+    ext_modules = cythonize(
+        [Extension("src.core.validator", ["src/core/validator.py"])],
+        build_dir="build",
+    )
+
+setup(ext_modules=ext_modules)
@@ -6,13 +6,123 @@ import re
 from typing import Iterable, Mapping
 
 from ..utils.logger import logger
+from .validator import VALID_UN_CLASSES
+
+try:
+    import pcre2
+
+    _HAS_PCRE2 = True
+except ImportError:  # pragma: no cover - optional accelerator
+    pcre2 = None
+    _HAS_PCRE2 = False
 
 NumberONUResult = dict[str, object]
 
+# ``re`` flags used by the extraction patterns and their PCRE2 equivalents.
+_PCRE2_FLAGS: dict[int, str] = {
+    re.IGNORECASE: "IGNORECASE",
+    re.VERBOSE: "VERBOSE",
+}
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile an extraction pattern, preferring PCRE2 with JIT when installed.
+
+    The ``pcre2`` binding mirrors the ``re.Pattern``/``re.Match`` API, so callers
+    use ``search``/``finditer``/``group`` unchanged. Falls back to ``re`` when
+    the binding is missing or rejects the pattern.
+    """
+    if _HAS_PCRE2:
+        try:
+            pcre2_flags = 0
+            for re_flag, name in _PCRE2_FLAGS.items():
+                if flags & re_flag:
+                    pcre2_flags |= getattr(pcre2, name)
+            return pcre2.compile(pattern, flags=pcre2_flags, jit=True)
+        except Exception as exc:
+            logger.debug("PCRE2 rejected pattern, using re: %s", exc)
+    return re.compile(pattern, flags)
+
+# CAS registry numbers: three dash-separated digit groups (2-7, 2 and 1 digits).
+_CAS_MIN_DIGITS = (2, 2, 1)
+_CAS_MAX_DIGITS = (7, 2, 1)
+
+def _is_word_char(char: str) -> bool:
+    """Return True for characters matched by ``\\w``."""
+    return char.isalnum() or char == "_"
+
+def _parse_cas(text: str, start: int) -> tuple[int, int] | None:
+    """Parse a CAS number beginning at ``start`` and return its span.
+
+    Walks the three digit groups as a small state machine, rejecting runs that
+    are too long or too short as soon as they are seen. Word boundaries match
+    the former ``\\b\\d{2,7}-\\d{2}-\\d\\b`` regex.
+    """
+    if start > 0 and _is_word_char(text[start - 1]):
+        return None
+    group = 0
+    digits = 0
+    pos = start
+    end = len(text)
+    while pos < end:
+        char = text[pos]
+        if char.isdecimal():
+            digits += 1
+            if digits > _CAS_MAX_DIGITS[group]:
+                return None
+        elif char == "-" and group < 2:
+            if digits < _CAS_MIN_DIGITS[group]:
+                return None
+            group += 1
+            digits = 0
+        else:
+            break
+        pos += 1
+    if group != 2 or digits != 1:
+        return None
+    if pos < end and _is_word_char(text[pos]):
+        return None
+    return start, pos
+
+def _find_cas(text: str) -> tuple[int, int] | None:
+    """Return the span of the first CAS number in ``text``.
+
+    Every CAS number contains a dash right after its first digit group, so
+    candidates are located with ``str.find`` and only the digit run before
+    each dash is handed to :func:`_parse_cas`.
+    """
+    dash = text.find("-")
+    while dash != -1:
+        start = dash
+        while start > 0 and dash - start <= _CAS_MAX_DIGITS[0] and text[start - 1].isdecimal():
+            start -= 1
+        if _CAS_MIN_DIGITS[0] <= dash - start <= _CAS_MAX_DIGITS[0]:
+            span = _parse_cas(text, start)
+            if span:
+                return span
+        dash = text.find("-", dash + 1)
+    return None
+
+# Casefolded literals that every match of a field's pattern contains. ``extract``
+# skips the regex scan for a field when none of them occur in the document.
+_FIELD_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "classificacao_onu": ("classe",),
+    "nome_produto": ("produto", "comercial"),
+    "fabricante": ("fabric", "fornecedor", "empresa", "social"),
+    "grupo_embalagem": ("embalagem",),
+    "incompatibilidades": ("incompat",),
+}
+
+# Arabic packing group numbers normalized to Roman numerals.
+_PACKING_GROUPS = {"1": "I", "2": "II", "3": "III"}
+
+def _mentions(haystack: str, field_name: str) -> bool:
+    """Return True when ``haystack`` contains any keyword of ``field_name``."""
+    return any(keyword in haystack for keyword in _FIELD_KEYWORDS[field_name])
+
 class HeuristicExtractor:
     """Rule-based fallback extractors operating on plain text."""
 
-    ONU_PATTERN = re.compile(
+    ONU_PATTERN = _compile(
         r"""
         (?:
             \b(?:UN|ONU)[\s#:;]{0,3}(\d{4})  # Patterns like UN1234 or ONU: 1234
@@ -57,6 +167,11 @@ class HeuristicExtractor:
         if sections:
             masked_sections = {k: self._mask_phone_numbers(v) for k, v in sections.items()}
 
+        # Single casefolded copy used to skip fields whose keywords never occur
+        haystack = masked_text.casefold()
+        if masked_sections:
+            haystack += "\n" + "\n".join(filter(None, masked_sections.values())).casefold()
+
         suggestions: dict[str, dict[str, object]] = {}
 
         numero_onu = self._extract_numero_onu(masked_text, masked_sections)
@@ -69,30 +184,44 @@ class HeuristicExtractor:
 
         # Pass found ONU value to class extractor
         onu_val = str(numero_onu["value"]) if numero_onu else None
-        classificacao = self._extract_classificacao(masked_text, masked_sections, onu_number=onu_val)
-        if classificacao:
-            suggestions["classificacao_onu"] = classificacao
-
-        nome_produto = self._extract_nome_produto(masked_text, masked_sections)
-        if nome_produto:
-            suggestions["nome_produto"] = nome_produto
+        if onu_val in self.UN_CLASS_MAP or _mentions(haystack, "classificacao_onu"):
+            classificacao = self._extract_classificacao(masked_text, masked_sections, onu_number=onu_val)
+            if classificacao:
+                suggestions["classificacao_onu"] = classificacao
+
+        if _mentions(haystack, "nome_produto"):
+            nome_produto = self._extract_nome_produto(masked_text, masked_sections)
+            if nome_produto:
+                suggestions["nome_produto"] = nome_produto
+
+        if _mentions(haystack, "fabricante"):
+            fabricante = self._extract_fabricante(masked_text, masked_sections)
+            if fabricante:
+                suggestions["fabricante"] = fabricante
+
+        if _mentions(haystack, "grupo_embalagem"):
+            grupo_embalagem = self._extract_grupo_embalagem(masked_text, masked_sections)
+            if grupo_embalagem:
+                suggestions["grupo_embalagem"] = grupo_embalagem
+
+        if _mentions(haystack, "incompatibilidades"):
+            incompatibilidades = self._extract_incompatibilidades(
+                masked_text,
+                masked_sections,
+            )
+            if incompatibilidades:
+                suggestions["incompatibilidades"] = incompatibilidades
 
-        fabricante = self._extract_fabricante(masked_text, masked_sections)
-        if fabricante:
-            suggestions["fabricante"] = fabricante
-
-        grupo_embalagem = self._extract_grupo_embalagem(masked_text, masked_sections)
-        if grupo_embalagem:
-            suggestions["grupo_embalagem"] = grupo_embalagem
+        return suggestions
 
-        incompatibilidades = self._extract_incompatibilidades(
-            masked_text,
-            masked_sections,
-        )
-        if incompatibilidades:
-            suggestions["incompatibilidades"] = incompatibilidades
+    def extract_batch(self, texts: Iterable[str]) -> list[dict[str, dict[str, object]]]:
+        """Return heuristic suggestions for each document in ``texts``.
 
-        return suggestions
+        Results are identical to calling :meth:`extract` per document; the
+        bound method is resolved once for the whole batch.
+        """
+        extract = self.extract
+        return [extract(text=text) for text in texts]
 
     def _mask_phone_numbers(self, text: str) -> str:
         """Replace phone numbers with [PHONE] placeholder to avoid false positives."""
@@ -198,8 +327,6 @@ class HeuristicExtractor:
 
         return best_match
 
-    CAS_PATTERN = re.compile(r"\b\d{2,7}-\d{2}-\d\b")
-
     def _extract_numero_cas(
         self,
         text: str,
@@ -208,11 +335,12 @@ class HeuristicExtractor:
         """Locate CAS numbers in the text."""
         search_space: Iterable[str] = sections.values() if sections else [text]
         for block in search_space:
-            match = self.CAS_PATTERN.search(block)
-            if not match:
+            span = _find_cas(block)
+            if not span:
                 continue
-            snippet = block[max(0, match.start() - 60) : match.end() + 60]
-            value = match.group(0)
+            start, end = span
+            snippet = block[max(0, start - 60) : end + 60]
+            value = block[start:end]
             logger.debug("Heuristic numero CAS detected: %s", value)
             return {
                 "value": value,
@@ -221,7 +349,7 @@ class HeuristicExtractor:
             }
         return None
 
-    CLASS_PATTERN = re.compile(
+    CLASS_PATTERN = _compile(
         r"\bclasse\s*(?:de\s*risco)?\s*(\d(?:\.\d)?)",
         re.IGNORECASE,
     )
@@ -245,7 +373,10 @@ class HeuristicExtractor:
 
         search_space: Iterable[str] = sections.values() if sections else [text]
         for block in search_space:
-            match = self.CLASS_PATTERN.search(block)
+            match = next(
+                (m for m in self.CLASS_PATTERN.finditer(block) if m.group(1) in VALID_UN_CLASSES),
+                None,
+            )
             if not match:
                 continue
             value = match.group(1)
@@ -258,7 +389,7 @@ class HeuristicExtractor:
             }
         return None
 
-    PRODUCT_NAME_PATTERN = re.compile(
+    PRODUCT_NAME_PATTERN = _compile(
         r"(?P<label>(?:nome\s*(?:comercial|do\s+produto|do\s+produto\s+qu[íi]mico)|identifica(?:ç|c)[aã]o\s+do\s+produto|identificador\s+do\s+produto|produto))\s*[:\-]\s*(?P<value>.{3,120})",
         re.IGNORECASE,
     )
@@ -292,7 +423,7 @@ class HeuristicExtractor:
             }
         return None
 
-    MANUFACTURER_PATTERN = re.compile(
+    MANUFACTURER_PATTERN = _compile(
         r"(?P<label>(?:fabricante|fabricado\s+por|fornecedor(?:\/distribuidor)?|empresa|raz[aã]o\s+social))\s*[:\-]\s*(?P<value>.{3,120})",
         re.IGNORECASE,
     )
@@ -324,7 +455,7 @@ class HeuristicExtractor:
             }
         return None
 
-    PACKING_GROUP_PATTERN = re.compile(
+    PACKING_GROUP_PATTERN = _compile(
         r"grupo\s*(?:de)?\s*embalagem\s*[:\-]?\s*(I{1,3}|III|II|I|1|2|3)\b",
         re.IGNORECASE,
     )
@@ -347,12 +478,7 @@ class HeuristicExtractor:
                 continue
             value = match.group(1).upper()
             # Normalize to Roman numerals
-            if value == "1":
-                value = "I"
-            elif value == "2":
-                value = "II"
-            elif value == "3":
-                value = "III"
+            value = _PACKING_GROUPS.get(value, value)
             snippet = block[max(0, match.start() - 50) : match.end() + 50]
             logger.debug("Heuristic grupo embalagem detected: %s", value)
             return {
@@ -364,7 +490,7 @@ class HeuristicExtractor:
 
     # New pattern for incompatibilities. Often appears in Section 10 (Estabilidade e reatividade)
     # Example labels: "Incompatibilidades", "Incompatível com", "Materiais incompatíveis"
-    INCOMPATIBILIDADES_PATTERN = re.compile(
+    INCOMPATIBILIDADES_PATTERN = _compile(
         r"(?P<label>(?:materiais?\s+incompat[ií]veis?|incompat[ií]vel\s+com|incompatibilidades?))\s*[:\-]?\s*(?P<value>.{3,200})",
         re.IGNORECASE,
     )
@@ -406,3 +532,26 @@ class HeuristicExtractor:
                 "context": snippet.strip(),
             }
         return None
+
+_WARMUP_TEXT = (
+    "Nome do produto: Etanol\nFabricante: ACME\nUN1170 CAS 64-17-5\n"
+    "Classe de risco 3\nGrupo de embalagem: II\nIncompatibilidades: oxidantes"
+)
+
+def _warm_up_patterns() -> None:
+    """Run every extraction pattern once at import.
+
+    Lazy per-pattern setup (PCRE2 JIT state, match-data buffers) then happens
+    here instead of on the first real document.
+    """
+    for pattern in (
+        HeuristicExtractor.ONU_PATTERN,
+        HeuristicExtractor.CLASS_PATTERN,
+        HeuristicExtractor.PRODUCT_NAME_PATTERN,
+        HeuristicExtractor.MANUFACTURER_PATTERN,
+        HeuristicExtractor.PACKING_GROUP_PATTERN,
+        HeuristicExtractor.INCOMPATIBILIDADES_PATTERN,
+    ):
+        pattern.search(_WARMUP_TEXT)
+
+_warm_up_patterns()
@@ -18,8 +18,8 @@ import json
 import os
 import random
 import time
-from dataclasses import dataclass
-from typing import Any, cast
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
 
 import httpx
 
@@ -27,37 +27,80 @@ from ..utils.config import DATA_DIR
 from ..utils.logger import logger
 from ..utils.onu_lookup import lookup_un
 
-@dataclass
+# Fixed-point scale for token counts: one token is one million micro-tokens.
+_MICRO_TOKENS = 1_000_000
+_NS_PER_SECOND = 1_000_000_000
+
+_T = TypeVar("_T")
+
+def _setting(value: _T | None, env_name: str, default: str, convert: Callable[[str], _T]) -> _T:
+    """Return ``value``, or the converted environment variable when it is None."""
+    return value if value is not None else convert(os.getenv(env_name, default))
+
 class TokenBucket:
-    """Token bucket for rate limiting to prevent IP bans."""
+    """Token bucket for rate limiting to prevent IP bans.
 
-    capacity: float  # Maximum tokens
-    tokens: float  # Current tokens
-    rate: float  # Tokens per second refill rate
-    last_update: float  # Last refill timestamp
+    Tokens are kept as integer micro-tokens and time as integer nanoseconds
+    from ``clock`` (``time.monotonic_ns`` by default), so refills accumulate
+    no float rounding error and ignore wall-clock adjustments.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        tokens: float,
+        rate: float,
+        last_update: int | None = None,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        self._clock = clock
+        self.capacity_micro = round(capacity * _MICRO_TOKENS)  # Maximum tokens
+        self.tokens_micro = round(tokens * _MICRO_TOKENS)  # Current tokens
+        self.rate_micro = round(rate * _MICRO_TOKENS)  # Micro-tokens refilled per second
+        # Last refill timestamp in clock nanoseconds
+        self.last_update_ns = clock() if last_update is None else last_update
+
+    @property
+    def capacity(self) -> float:
+        """Maximum tokens."""
+        return self.capacity_micro / _MICRO_TOKENS
+
+    @property
+    def tokens(self) -> float:
+        """Currently available tokens."""
+        return self.tokens_micro / _MICRO_TOKENS
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self.rate_micro / _MICRO_TOKENS
 
     def consume(self, amount: float = 1.0) -> bool:
         """Try to consume tokens; return True if successful."""
+        needed = round(amount * _MICRO_TOKENS)
         self._refill()
-        if self.tokens >= amount:
-            self.tokens -= amount
+        if self.tokens_micro >= needed:
+            self.tokens_micro -= needed
             return True
         return False
 
     def wait_time(self, amount: float = 1.0) -> float:
         """Calculate seconds to wait for tokens to be available."""
+        needed = round(amount * _MICRO_TOKENS)
         self._refill()
-        if self.tokens >= amount:
+        if self.tokens_micro >= needed:
             return 0.0
-        deficit = amount - self.tokens
-        return deficit / self.rate
+        return (needed - self.tokens_micro) / self.rate_micro
 
     def _refill(self) -> None:
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_update
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-        self.last_update = now
+        """Refill tokens based on elapsed monotonic time."""
+        now = self._clock()
+        added = (now - self.last_update_ns) * self.rate_micro // _NS_PER_SECOND
+        if added <= 0:
+            # Keep last_update_ns so time worth less than a micro-token keeps accruing
+            return
+        self.tokens_micro = min(self.capacity_micro, self.tokens_micro + added)
+        self.last_update_ns = now
 
 class SearXNGClient:
     """SearXNG search client with Crawl4AI content extraction.
@@ -81,50 +124,93 @@ class SearXNGClient:
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
     ]
 
-    def __init__(self, http_client_factory: Any | None = None) -> None:
+    def __init__(
+        self,
+        http_client_factory: Any | None = None,
+        *,
+        instances: list[str] | None = None,
+        rate_limit: float | None = None,
+        burst_limit: float | None = None,
+        min_delay: float | None = None,
+        max_retries: int | None = None,
+        backoff: float | None = None,
+        timeout: int | None = None,
+        cache_enabled: bool | None = None,
+        cache_db_path: str | None = None,
+        cache_ttl: int | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        """Initialize the client.
+
+        Every keyword argument left as ``None`` falls back to its
+        ``SEARXNG_*`` environment variable, then to the built-in default.
+
+        Args:
+            http_client_factory: Takes a timeout, returns an httpx.Client-like context manager
+            instances: SearXNG base URLs (``SEARXNG_INSTANCES``)
+            rate_limit: Requests per second (``SEARXNG_RATE_LIMIT``)
+            burst_limit: Token bucket capacity (``SEARXNG_BURST_LIMIT``)
+            min_delay: Minimum seconds between requests (``SEARXNG_MIN_DELAY``)
+            max_retries: Retries per search (``SEARXNG_MAX_RETRIES``)
+            backoff: Initial backoff in seconds (``SEARXNG_BACKOFF``)
+            timeout: HTTP timeout in seconds (``SEARXNG_TIMEOUT``)
+            cache_enabled: Use the DuckDB cache (``SEARXNG_CACHE``)
+            cache_db_path: DuckDB file or ``":memory:"`` (``SEARXNG_CACHE_DB_PATH``)
+            cache_ttl: Cache TTL in seconds (``SEARXNG_CACHE_TTL``)
+            sleep: Used for every rate-limit, backoff and crawl delay
+            clock: Nanosecond clock for the token bucket and min-delay safeguard
+        """
+        self._sleep = sleep
+        self._clock = clock
         # SearXNG instances (with fallback)
         default_instances = [
             "https://searx.be",
             "https://search.bus-hit.me",
             "https://searx.tiekoetter.com",
         ]
-        custom_instances = os.getenv("SEARXNG_INSTANCES", "").split(",")
+        if instances is None:
+            instances = os.getenv("SEARXNG_INSTANCES", "").split(",")
         self.instances = [
-            i.strip() for i in custom_instances if i.strip()
+            i.strip() for i in instances if i.strip()
         ] or default_instances
         self.current_instance_idx = 0
         self.instance_health: dict[str, float] = {}  # instance -> last success time
 
         # Rate limiting (token bucket)
-        rate = float(os.getenv("SEARXNG_RATE_LIMIT", "2.0"))  # requests/sec
-        capacity = float(os.getenv("SEARXNG_BURST_LIMIT", "5.0"))  # burst tokens
+        rate = _setting(rate_limit, "SEARXNG_RATE_LIMIT", "2.0", float)  # requests/sec
+        capacity = _setting(burst_limit, "SEARXNG_BURST_LIMIT", "5.0", float)  # burst tokens
         self.rate_limiter = TokenBucket(
             capacity=capacity,
             tokens=capacity,
             rate=rate,
-            last_update=time.time(),
+            clock=clock,
         )
 
         # Additional delay between requests (safeguard)
-        self.min_request_delay = float(os.getenv("SEARXNG_MIN_DELAY", "1.0"))
-        self.last_request_time = 0.0
+        self.min_request_delay = _setting(min_delay, "SEARXNG_MIN_DELAY", "1.0", float)
+        self.last_request_ns: int | None = None  # clock() at the last request
 
         # Retry config
-        self.max_retries = int(os.getenv("SEARXNG_MAX_RETRIES", "3"))
-        self.initial_backoff = float(os.getenv("SEARXNG_BACKOFF", "2.0"))
+        self.max_retries = _setting(max_retries, "SEARXNG_MAX_RETRIES", "3", int)
+        self.initial_backoff = _setting(backoff, "SEARXNG_BACKOFF", "2.0", float)
 
         # Timeout
-        self.timeout = int(os.getenv("SEARXNG_TIMEOUT", "30"))
+        self.timeout = _setting(timeout, "SEARXNG_TIMEOUT", "30", int)
 
         # Search language (en, pt-BR, etc.)
         self.language = os.getenv("SEARXNG_LANGUAGE", "en")
 
         # Cache (persistent DuckDB)
-        self.cache_enabled = os.getenv("SEARXNG_CACHE", "1") in {"1", "true", "True"}
-        self.cache_ttl = int(os.getenv("SEARXNG_CACHE_TTL", str(7 * 24 * 3600)))
-        self.cache_db_path = os.getenv(
+        self.cache_enabled = _setting(
+            cache_enabled, "SEARXNG_CACHE", "1", lambda raw: raw in {"1", "true", "True"}
+        )
+        self.cache_ttl = _setting(cache_ttl, "SEARXNG_CACHE_TTL", str(7 * 24 * 3600), int)
+        self.cache_db_path = _setting(
+            cache_db_path,
             "SEARXNG_CACHE_DB_PATH",
             str(DATA_DIR / "duckdb" / "searxng_cache.db"),
+            str,
         )
         self._cache_conn = None
         if self.cache_enabled:
@@ -147,7 +233,10 @@ class SearXNGClient:
         try:
             import duckdb
 
-            os.makedirs(os.path.dirname(self.cache_db_path), exist_ok=True)
+            cache_dir = os.path.dirname(self.cache_db_path)
+            if cache_dir:
+                # Bare file names and ":memory:" need no directory
+                os.makedirs(cache_dir, exist_ok=True)
             self._cache_conn = duckdb.connect(self.cache_db_path)
             self._cache_conn.execute(
                 """
@@ -173,7 +262,8 @@ class SearXNGClient:
             logger.error("Failed to initialize cache: %s", exc)
             self.cache_enabled = False
 
-    def _cache_key(self, query: str, num_results: int = 5) -> str:
+    @staticmethod
+    def _cache_key(query: str, num_results: int = 5) -> str:
         """Generate cache key for search query."""
         key_str = f"{query}|{num_results}"
         return hashlib.md5(key_str.encode()).hexdigest()
@@ -236,22 +326,22 @@ class SearXNGClient:
 
     def _wait_for_rate_limit(self) -> None:
         """Block until rate limit allows next request."""
-        # Token bucket wait
-        wait_tokens = self.rate_limiter.wait_time(1.0)
-        if wait_tokens > 0:
+        # Token bucket: only compute a wait when the bucket is empty, so the
+        # common path refills (and reads the clock) once
+        if not self.rate_limiter.consume(1.0):
+            wait_tokens = self.rate_limiter.wait_time(1.0)
             logger.debug("Rate limit: waiting %.2fs for tokens", wait_tokens)
-            time.sleep(wait_tokens)
-            self.rate_limiter.consume(1.0)
-        else:
+            self._sleep(wait_tokens)
             self.rate_limiter.consume(1.0)
 
         # Additional min delay safeguard
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_delay:
-            delay = self.min_request_delay - elapsed
-            logger.debug("Min delay safeguard: waiting %.2fs", delay)
-            time.sleep(delay)
-        self.last_request_time = time.time()
+        if self.last_request_ns is not None:
+            elapsed = (self._clock() - self.last_request_ns) / 1e9
+            if elapsed < self.min_request_delay:
+                delay = self.min_request_delay - elapsed
+                logger.debug("Min delay safeguard: waiting %.2fs", delay)
+                self._sleep(delay)
+        self.last_request_ns = self._clock()
 
     def _get_user_agent(self) -> str:
         """Rotate user agents to avoid detection."""
@@ -338,7 +428,7 @@ class SearXNGClient:
                         self.max_retries,
                         wait,
                     )
-                    time.sleep(wait)
+                    self._sleep(wait)
                     attempt += 1
                     # Try next instance on next attempt
                     self.current_instance_idx = (
@@ -356,7 +446,7 @@ class SearXNGClient:
                         exc,
                         wait,
                     )
-                    time.sleep(wait)
+                    self._sleep(wait)
                     attempt += 1
                     self.current_instance_idx = (
                         self.current_instance_idx + 1
@@ -463,7 +553,7 @@ class SearXNGClient:
             return cached
 
         # Apply minimum crawl delay (stricter than search)
-        time.sleep(CRAWL4AI_MIN_DELAY)
+        self._sleep(CRAWL4AI_MIN_DELAY)
 
         try:
             content = asyncio.run(self._crawl_url_async(url))
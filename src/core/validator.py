@@ -1,59 +1,85 @@
+# cython: language_level=3
 """Validation schemas for extracted FDS fields."""
 
 from __future__ import annotations
 
 import re
+import sys
+from collections.abc import Iterable
+from functools import lru_cache
 from typing import ClassVar
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
 from ..utils.url_validator import validate_source_urls
 
+def _raise_on_error(checked: tuple[str, str | None]) -> str:
+    """Unwrap a ``(value, error)`` check result, raising ValueError on error."""
+    value, error = checked
+    if error is not None:
+        raise ValueError(error)
+    return value
+
+# Placeholders the extractors emit when a field is missing or failed.
+_SENTINELS = frozenset({"NAO ENCONTRADO", "ERRO"})
+
+_CAS_RE = re.compile(r"^\d{2,7}-\d{2}-\d$")
+
 class ExtractionResult(BaseModel):
     """Base schema for a validated extraction."""
 
+    # Validated results are values; extra payload keys (e.g. "source") are ignored
+    model_config = ConfigDict(frozen=True)
+
     value: str
     confidence: float = Field(ge=0.0, le=1.0)
     context: str = ""
     source_urls: list[str] = Field(default_factory=list)
 
-class NumeroONU(ExtractionResult):
-    """Validate ONU number format and range."""
-
-    @field_validator("value")
-    @classmethod
-    def check_un_number(cls, value: str) -> str:
-        if value in {"NAO ENCONTRADO", "ERRO"}:
-            return value
-        value = value.strip().upper()
-        if value.startswith("UN"):
-            value = value[2:].strip()
-        if not value.isdigit() or len(value) != 4:
-            raise ValueError("Numero ONU deve conter 4 digitos.")
-        number = int(value)
-        if not (4 <= number <= 3506):
-            raise ValueError("Numero ONU fora do intervalo valido.")
-        return value
-
-class NumeroCAS(ExtractionResult):
-    """Validate CAS number formatting."""
+_ONU_MIN = "0004"
+_ONU_MAX = "3506"
 
-    CAS_PATTERN: ClassVar[re.Pattern[str]] = re.compile(r"^\d{2,7}-\d{2}-\d$")
+def _check_onu(value: str) -> tuple[str, str | None]:
+    """Check an ONU number; return it normalized plus an error message."""
+    if value in _SENTINELS:
+        return value, None
+    value = value.strip().upper()
+    if value.startswith("UN"):
+        value = value[2:].strip()
+    # isascii is a flag read; ASCII-only strings then compare with memcmp
+    if len(value) != 4 or not value.isascii() or not value.isdecimal():
+        return value, "Numero ONU deve conter 4 digitos."
+    # Fixed-width digit strings order like the numbers they spell
+    if not (_ONU_MIN <= value <= _ONU_MAX):
+        return value, "Numero ONU fora do intervalo valido."
+    return value, None
 
-    @field_validator("value")
-    @classmethod
-    def check_cas(cls, value: str) -> str:
-        if value in {"NAO ENCONTRADO", "ERRO"}:
-            return value
-        value = value.strip()
-        if not cls.CAS_PATTERN.match(value):
-            raise ValueError("Numero CAS deve seguir o formato ####-##-#.")
-        return value
+def _is_cas(value: str) -> bool:
+    """Return True when ``value`` matches ``_CAS_RE``, without the regex engine."""
+    head, _, rest = value.partition("-")
+    middle, _, check = rest.partition("-")
+    # isdecimal accepts exactly the Unicode digits re's \d does
+    return (
+        2 <= len(head) <= 7
+        and head.isdecimal()
+        and len(middle) == 2
+        and middle.isdecimal()
+        and len(check) == 1
+        and check.isdecimal()
+    )
 
-class ClassificacaoONU(ExtractionResult):
-    """Validate ONU class enumeration."""
+def _check_cas(value: str) -> tuple[str, str | None]:
+    """Check a CAS number; return it normalized plus an error message."""
+    if value in _SENTINELS:
+        return value, None
+    value = value.strip()
+    if not _is_cas(value):
+        return value, "Numero CAS deve seguir o formato ####-##-#."
+    return value, None
 
-    VALID_CLASSES: ClassVar[set[str]] = {
+# UN dangerous-goods class labels ClassificacaoONU accepts.
+VALID_UN_CLASSES = frozenset(
+    {
         "1",
         "1.1",
         "1.2",
@@ -76,20 +102,93 @@ class ClassificacaoONU(ExtractionResult):
         "8",
         "9",
     }
+)
+
+def _extract_class(value: str) -> str | None:
+    """Return the first ``D`` or ``D.D`` label in ``value``, or None."""
+    for i, char in enumerate(value):
+        if char.isdecimal():
+            if value[i + 1 : i + 2] == "." and value[i + 2 : i + 3].isdecimal():
+                return value[i : i + 3]
+            return char
+    return None
+
+def _check_classe(value: str) -> tuple[str, str | None]:
+    """Check an ONU class; return its numeric label plus an error message."""
+    if value in _SENTINELS:
+        return value, None
+    # Canonical labels need no extraction
+    if value in VALID_UN_CLASSES:
+        return value, None
+    # Extract numeric part
+    label = _extract_class(value)
+    if label is not None:
+        value = label
+    value = value.strip()
+    if value not in VALID_UN_CLASSES:
+        return value, "Classe ONU invalida."
+    return value, None
+
+class NumeroONU(ExtractionResult):
+    """Validate ONU number format and range."""
+
+    @field_validator("value")
+    @classmethod
+    def check_un_number(cls, value: str) -> str:
+        return _raise_on_error(_check_onu(value))
+
+class NumeroCAS(ExtractionResult):
+    """Validate CAS number formatting."""
+
+    CAS_PATTERN: ClassVar[re.Pattern[str]] = _CAS_RE
+
+    @field_validator("value")
+    @classmethod
+    def check_cas(cls, value: str) -> str:
+        return _raise_on_error(_check_cas(value))
+
+class ClassificacaoONU(ExtractionResult):
+    """Validate ONU class enumeration."""
+
+    VALID_CLASSES: ClassVar[set[str]] = set(VALID_UN_CLASSES)
 
     @field_validator("value")
     @classmethod
     def check_class(cls, value: str) -> str:
-        if value in {"NAO ENCONTRADO", "ERRO"}:
-            return value
-        # Extract numeric part
-        match = re.search(r"\d(?:\.\d)?", value)
-        if match:
-            value = match.group(0)
-        value = value.strip()
-        if value not in cls.VALID_CLASSES:
-            raise ValueError("Classe ONU invalida.")
-        return value
+        return _raise_on_error(_check_classe(value))
+
+def _check_nome(value: str) -> tuple[str, str | None]:
+    """Check a product name; return it normalized plus an error message."""
+    if value in _SENTINELS:
+        return value, None
+    value = value.strip()
+    if len(value) < 3:
+        return value, "Nome do produto muito curto."
+    if len(value) > 200:
+        return value, "Nome do produto muito longo."
+    return value, None
+
+def _check_fabricante(value: str) -> tuple[str, str | None]:
+    """Check a manufacturer name; return it normalized plus an error message."""
+    if value in _SENTINELS:
+        return value, None
+    value = value.strip()
+    if len(value) < 3:
+        return value, "Nome do fabricante muito curto."
+    if len(value) > 200:
+        return value, "Nome do fabricante muito longo."
+    return value, None
+
+_VALID_GROUPS = frozenset({"I", "II", "III"})
+
+def _check_grupo(value: str) -> tuple[str, str | None]:
+    """Check a packing group; return it normalized plus an error message."""
+    if value in _SENTINELS:
+        return value, None
+    value = value.strip().upper()
+    if value not in _VALID_GROUPS:
+        return value, "Grupo de embalagem deve ser I, II ou III."
+    return value, None
 
 class NomeProduto(ExtractionResult):
     """Validate product name."""
@@ -97,14 +196,7 @@ class NomeProduto(ExtractionResult):
     @field_validator("value")
     @classmethod
     def check_product_name(cls, value: str) -> str:
-        if value in {"NAO ENCONTRADO", "ERRO"}:
-            return value
-        value = value.strip()
-        if len(value) < 3:
-            raise ValueError("Nome do produto muito curto.")
-        if len(value) > 200:
-            raise ValueError("Nome do produto muito longo.")
-        return value
+        return _raise_on_error(_check_nome(value))
 
 class Fabricante(ExtractionResult):
     """Validate manufacturer name."""
@@ -112,29 +204,132 @@ class Fabricante(ExtractionResult):
     @field_validator("value")
     @classmethod
     def check_manufacturer(cls, value: str) -> str:
-        if value in {"NAO ENCONTRADO", "ERRO"}:
-            return value
-        value = value.strip()
-        if len(value) < 3:
-            raise ValueError("Nome do fabricante muito curto.")
-        if len(value) > 200:
-            raise ValueError("Nome do fabricante muito longo.")
-        return value
+        return _raise_on_error(_check_fabricante(value))
 
 class GrupoEmbalagem(ExtractionResult):
     """Validate packing group."""
 
-    VALID_GROUPS: ClassVar[set[str]] = {"I", "II", "III"}
+    VALID_GROUPS: ClassVar[set[str]] = set(_VALID_GROUPS)
 
     @field_validator("value")
     @classmethod
     def check_packing_group(cls, value: str) -> str:
-        if value in {"NAO ENCONTRADO", "ERRO"}:
-            return value
-        value = value.strip().upper()
-        if value not in cls.VALID_GROUPS:
-            raise ValueError("Grupo de embalagem deve ser I, II ou III.")
-        return value
+        return _raise_on_error(_check_grupo(value))
+
+# Confidence at or above _CONF_VALID is valid, above _CONF_WARN a warning.
+_CONF_VALID = 0.9
+_CONF_WARN = 0.7
+_LOW_CONFIDENCE_MESSAGE = f"Confianca abaixo do limiar minimo ({_CONF_WARN})."
+_CONFIDENCE_RANGE_MESSAGE = "Confianca deve estar entre 0 e 1."
+
+# Shared results for every outcome without a per-value message.
+_R_VALID = ("valid", None)
+_R_WARN = ("warning", None)
+_R_NOT_VALIDATED = ("not_validated", None)
+_R_LOW_CONFIDENCE = ("invalid", _LOW_CONFIDENCE_MESSAGE)
+_R_OUT_OF_RANGE = ("invalid", _CONFIDENCE_RANGE_MESSAGE)
+
+def _grade_confidence(confidence: float) -> tuple[str, str | None]:
+    """Map an in-range confidence onto the valid/warning/invalid thresholds."""
+    if confidence >= _CONF_VALID:
+        return _R_VALID
+    if confidence >= _CONF_WARN:
+        return _R_WARN
+    return _R_LOW_CONFIDENCE
+
+def _error_message(exc: ValidationError) -> str:
+    """Return the first pydantic error worded as the fast path reports it."""
+    error = exc.errors()[0]
+    if error["type"] == "value_error":
+        # Drop pydantic's "Value error, " prefix
+        return str(error["ctx"]["error"])
+    if error["loc"] == ("confidence",) and error["type"] in (
+        "greater_than_equal",
+        "less_than_equal",
+    ):
+        return _CONFIDENCE_RANGE_MESSAGE
+    return str(error["msg"])
+
+def _plain_extras(payload: dict[str, object]) -> bool:
+    """Return True when the optional payload keys need no pydantic coercion."""
+    if not isinstance(payload.get("context", ""), str):
+        return False
+    source_urls = payload.get("source_urls", [])
+    return isinstance(source_urls, list) and all(isinstance(url, str) for url in source_urls)
+
+class _FieldCore:
+    """Pydantic-free validation of one field type, used on the hot path.
+
+    Never instantiated: subclasses pair a ``model`` with its ``_check`` and
+    grade payloads through the ``try_validate*`` classmethods.
+    """
+
+    model: ClassVar[type[ExtractionResult]] = ExtractionResult
+
+    @staticmethod
+    def _check(value: str) -> tuple[str, str | None]:
+        return value, None
+
+    @classmethod
+    def try_validate(cls, payload: dict[str, object]) -> tuple[str, str | None]:
+        """Validate and grade ``payload`` in one pass, without raising.
+
+        Returns ``("valid", None)``, ``("warning", None)`` or ``("invalid", message)``.
+        """
+        # Read each key once; well-typed values go straight to the fast path
+        value = payload.get("value")
+        confidence = payload.get("confidence")
+        if isinstance(value, str) and type(confidence) in (float, int) and _plain_extras(payload):
+            return _try_validate_cached(cls, value, confidence)
+        try:
+            confidence = cls.model(**payload).confidence
+        except ValidationError as exc:
+            return "invalid", _error_message(exc)
+        return _grade_confidence(confidence)
+
+    @classmethod
+    def try_validate_fields(cls, value: str, confidence: float) -> tuple[str, str | None]:
+        """Like :meth:`try_validate` for an already unpacked, well-typed payload."""
+        # Value before confidence, in the order pydantic reports them
+        _, error = cls._check(value)
+        if error is not None:
+            return "invalid", error
+        if not 0.0 <= confidence <= 1.0:
+            return _R_OUT_OF_RANGE
+        return _grade_confidence(confidence)
+
+# Extraction batches repeat the same ONU/CAS values; grading is pure, so the
+# exact (core, value, confidence) triple is memoized. Confidence is not
+# rounded, which would move values across the thresholds.
+@lru_cache(maxsize=4096)
+def _try_validate_cached(
+    core: type[_FieldCore], value: str, confidence: float
+) -> tuple[str, str | None]:
+    return core.try_validate_fields(value, confidence)
+
+class _NumeroONUCore(_FieldCore):
+    model = NumeroONU
+    _check = staticmethod(_check_onu)
+
+class _NumeroCASCore(_FieldCore):
+    model = NumeroCAS
+    _check = staticmethod(_check_cas)
+
+class _ClassificacaoONUCore(_FieldCore):
+    model = ClassificacaoONU
+    _check = staticmethod(_check_classe)
+
+class _NomeProdutoCore(_FieldCore):
+    model = NomeProduto
+    _check = staticmethod(_check_nome)
+
+class _FabricanteCore(_FieldCore):
+    model = Fabricante
+    _check = staticmethod(_check_fabricante)
+
+class _GrupoEmbalagemCore(_FieldCore):
+    model = GrupoEmbalagem
+    _check = staticmethod(_check_grupo)
 
 VALIDATORS: dict[str, type[ExtractionResult]] = {
     "numero_onu": NumeroONU,
@@ -145,19 +340,42 @@ VALIDATORS: dict[str, type[ExtractionResult]] = {
     "grupo_embalagem": GrupoEmbalagem,
 }
 
+# Field name -> validator, resolved once; well-typed payloads skip pydantic.
+# Keys are interned so callers passing string literals (interned by CPython)
+# hit the dict's identity check before any string comparison.
+_FIELD_VALIDATORS: dict[str, type[_FieldCore]] = {
+    sys.intern(field_name): core
+    for field_name, core in (
+        ("numero_onu", _NumeroONUCore),
+        ("numero_cas", _NumeroCASCore),
+        ("classificacao_onu", _ClassificacaoONUCore),
+        ("nome_produto", _NomeProdutoCore),
+        ("fabricante", _FabricanteCore),
+        ("grupo_embalagem", _GrupoEmbalagemCore),
+    )
+}
+
 def validate_field(field_name: str, payload: dict[str, object]) -> tuple[str, str | None]:
-    """Validate a field and return status plus optional message."""
-    schema = VALIDATORS.get(field_name)
-    if not schema:
-        return "not_validated", None
-
-    try:
-        schema(**payload)
-    except ValidationError as exc:
-        return "invalid", str(exc.errors()[0]["msg"])
-
-    if payload.get("confidence", 0) >= 0.9:
-        return "valid", None
-    if payload.get("confidence", 0) >= 0.7:
-        return "warning", None
-    return "invalid", "Confianca abaixo do limiar minimo (0.7)."
+    """Validate a field and return status plus optional message.
+
+    Pass ``field_name`` as a literal (or interned) string for the fastest lookup.
+    """
+    core = _FIELD_VALIDATORS.get(field_name)
+    if core is None:
+        return _R_NOT_VALIDATED
+    return core.try_validate(payload)
+
+def validate_field_many(
+    items: Iterable[tuple[str, dict[str, object]]],
+) -> list[tuple[str, str | None]]:
+    """Validate ``(field_name, payload)`` pairs; same results as :func:`validate_field`.
+
+    The validator table lookup is bound once for the batch.
+    """
+    get_core = _FIELD_VALIDATORS.get
+    results: list[tuple[str, str | None]] = []
+    append = results.append
+    for field_name, payload in items:
+        core = get_core(field_name)
+        append(_R_NOT_VALIDATED if core is None else core.try_validate(payload))
+    return results
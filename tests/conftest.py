@@ -2,10 +2,86 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import httpx
 import pytest
 
+from src.core.heuristics import HeuristicExtractor
+
+@dataclass(slots=True, frozen=True)
+class FakeResponse:
+    """Minimal stand-in for ``httpx.Response``."""
+
+    status_code: int = 200
+    json_data: dict = field(default_factory=dict)
+    text: str = ""
+
+    def json(self) -> dict:
+        return self.json_data
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"HTTP {self.status_code}",
+                request=httpx.Request("GET", "https://example.com"),
+                response=self,
+            )
+
+EMPTY_RESULTS = FakeResponse(json_data={"results": []})
+
+class MockHTTPClient:
+    """Scripted ``httpx.Client`` replacement for GET and POST based clients.
+
+    Acts as its own context manager, so ``lambda timeout: client`` can stand
+    in for ``httpx.Client``.
+    """
+
+    def __init__(self, responses: list[FakeResponse | Exception] | None = None):
+        """
+        Initialize mock client with predefined responses.
+
+        Args:
+            responses: responses returned in order by reference; an
+                Exception entry is raised instead of returned. Once they
+                run out, every request gets ``EMPTY_RESULTS``.
+        """
+        self.responses = responses or []
+        self.call_count = 0
+        self.calls = []  # Track all calls as (url, params, headers, json)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get(self, url: str, params: dict | None = None, **kwargs):
+        """Mock GET request."""
+        return self._respond(url, params, kwargs.get("headers"), None)
+
+    def post(self, url: str, params: dict | None = None, **kwargs):
+        """Mock POST request."""
+        return self._respond(url, params, kwargs.get("headers"), kwargs.get("json"))
+
+    def _respond(self, url, params, headers, payload):
+        self.calls.append((url, params, headers, payload))
+
+        index = self.call_count
+        self.call_count += 1
+        if index >= len(self.responses):
+            # Default success response if no more mocked responses
+            return EMPTY_RESULTS
+
+        response = self.responses[index]
+
+        # Raise error if configured
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
 @pytest.fixture(scope="session")
 def project_root() -> Path:
     """Return the project root directory."""
@@ -23,6 +99,11 @@ def test_data_dir(project_root: Path) -> Path:
     test_dir.mkdir(exist_ok=True)
     return test_dir
 
+@pytest.fixture(scope="session")
+def extractor() -> HeuristicExtractor:
+    """Return a shared HeuristicExtractor; it holds no per-document state."""
+    return HeuristicExtractor()
+
 @pytest.fixture
 def sample_fds_text() -> str:
     """Return a sample FDS text for testing."""
@@ -5,30 +5,7 @@ import pytest
 
 from src.core.llm_client import GeminiClient
 
-class DummyResponse:
-    def __init__(self, data):
-        self._data = data
-
-    def raise_for_status(self):
-        return None
-
-    def json(self):
-        return self._data
-
-class DummyClient:
-    def __init__(self, data):
-        self._data = data
-        self.post_calls = []
-
-    def post(self, url, params=None, headers=None, json=None):  # noqa: A002 - shadowing ok in test
-        self.post_calls.append({"url": url, "params": params, "headers": headers, "json": json})
-        return DummyResponse(self._data)
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, *exc):
-        return False
+from .conftest import FakeResponse, MockHTTPClient
 
 def test_gemini_client_parses_json(monkeypatch):
     data = {
@@ -50,8 +27,9 @@ def test_gemini_client_parses_json(monkeypatch):
 
     import src.core.llm_client as llm_mod
 
-    # Patch httpx.Client to our dummy
-    monkeypatch.setattr(llm_mod.httpx, "Client", lambda timeout: DummyClient(data))
+    # Patch httpx.Client to our mock
+    http_client = MockHTTPClient(responses=[FakeResponse(json_data=data)])
+    monkeypatch.setattr(llm_mod.httpx, "Client", lambda timeout: http_client)
 
     client = GeminiClient()
     # Force api_key present for test_connection
@@ -67,3 +45,5 @@ def test_gemini_client_parses_json(monkeypatch):
     assert res["numero_onu"]["value"] == "1203"
     assert res["numero_cas"]["value"] == "67-56-1"
     # Confidence is a numeric value; content validated by keys above
+    # All fields are requested in a single POST
+    assert http_client.call_count == 1
@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
+import re
+from types import SimpleNamespace
+
 import pytest
 
+from src.core import heuristics
 from src.core.heuristics import HeuristicExtractor
+from src.core.validator import validate_field
+
+_FULL_FDS_TEXT = """
+    FICHA DE DADOS DE SEGURANÇA
+
+    1. Identificação
+    Produto: Etanol 95%
 
-@pytest.fixture
-def extractor() -> HeuristicExtractor:
-    """Create a fresh HeuristicExtractor instance for testing."""
-    return HeuristicExtractor()
+    3. Composição
+    CAS: 64-17-5
+    Concentração: 95%
+
+    14. Informações sobre transporte
+    Número ONU: 1170
+    Classe de risco 3
+    Grupo de embalagem: II
+    """
 
 class TestNumeroONU:
     """Test suite for ONU number extraction."""
@@ -109,6 +125,19 @@ class TestNumeroCAS:
         
         assert result is None
 
+    def test_reject_malformed_groups(self, extractor: HeuristicExtractor) -> None:
+        """Test rejection of digit groups outside the CAS layout."""
+        for text in ("Lote 12345678-90-1", "Ref 64-17-55", "Código A64-17-5", "Data 1-23-4"):
+            assert extractor._extract_numero_cas(text, None) is None
+
+    def test_first_cas_wins(self, extractor: HeuristicExtractor) -> None:
+        """Test that the leftmost CAS number is returned."""
+        text = "Faixa 10-20 %; CAS 7732-18-5; CAS 64-17-5"
+        result = extractor._extract_numero_cas(text, None)
+
+        assert result is not None
+        assert result["value"] == "7732-18-5"
+
 class TestClassificacaoONU:
     """Test suite for UN classification extraction."""
 
@@ -147,6 +176,23 @@ class TestClassificacaoONU:
         assert result is not None
         assert result["value"] == "4.1"
 
+    def test_skip_invalid_class(self, extractor: HeuristicExtractor) -> None:
+        """Test that tokens outside the UN class list are skipped."""
+        assert extractor._extract_classificacao("Classe 0", None) is None
+
+        result = extractor._extract_classificacao("Classe 1.9 (interna); Classe de risco 8", None)
+
+        assert result is not None
+        assert result["value"] == "8"
+
+    def test_accepts_only_validator_classes(self, extractor: HeuristicExtractor) -> None:
+        """Test bare class numbers the validator rejects are skipped."""
+        result = extractor._extract_classificacao("Classe 2; Classe 6.1", None)
+
+        assert result is not None
+        assert result["value"] == "6.1"
+        assert validate_field("classificacao_onu", result) == ("warning", None)
+
     def test_no_match(self, extractor: HeuristicExtractor) -> None:
         """Test when no classification is found."""
         text = "Produto não classificado para transporte."
@@ -159,23 +205,7 @@ class TestFullExtraction:
 
     def test_extract_all_fields(self, extractor: HeuristicExtractor) -> None:
         """Test extraction of all fields from complete FDS text."""
-        text = """
-        FICHA DE DADOS DE SEGURANÇA
-        
-        1. Identificação
-        Produto: Etanol 95%
-        
-        3. Composição
-        CAS: 64-17-5
-        Concentração: 95%
-        
-        14. Informações sobre transporte
-        Número ONU: 1170
-        Classe de risco 3
-        Grupo de embalagem: II
-        """
-        
-        results = extractor.extract(text=text, sections=None)
+        results = extractor.extract(text=_FULL_FDS_TEXT, sections=None)
         
         assert "numero_onu" in results
         assert results["numero_onu"]["value"] == "1170"
@@ -211,8 +241,67 @@ class TestFullExtraction:
         assert "numero_onu" not in results
         assert "classificacao_onu" not in results
 
+    def test_skips_fields_without_keywords(
+        self, extractor: HeuristicExtractor, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that fields whose keywords are absent are not scanned."""
+        def fail(*_args: object, **_kwargs: object) -> None:
+            raise AssertionError("scanned a field without keywords")
+
+        for name in ("_extract_nome_produto", "_extract_fabricante", "_extract_incompatibilidades"):
+            monkeypatch.setattr(extractor, name, fail)
+
+        results = extractor.extract(text="Transporte: UN 1170, grupo de embalagem II", sections=None)
+
+        assert results["numero_onu"]["value"] == "1170"
+        assert results["classificacao_onu"]["value"] == "3"  # inferred from the UN number
+        assert results["grupo_embalagem"]["value"] == "II"
+
+    def test_extract_batch(self, extractor: HeuristicExtractor) -> None:
+        """Test batch extraction matches per-document extraction."""
+        texts = [
+            _FULL_FDS_TEXT,
+            "Produto com CAS: 7732-18-5 mas sem ONU",
+            "Transporte: UN 1230, Classe 3",
+            "",
+        ]
+
+        results = extractor.extract_batch(texts)
+
+        assert results == [extractor.extract(text=text, sections=None) for text in texts]
+
     def test_empty_text(self, extractor: HeuristicExtractor) -> None:
         """Test extraction from empty text."""
         results = extractor.extract(text="", sections=None)
         
         assert results == {}
+
+class TestPatternCompilation:
+    """Test suite for the regex backend used by the extractor patterns."""
+
+    def test_falls_back_to_re(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that patterns compile with ``re`` when PCRE2 is unavailable."""
+        monkeypatch.setattr(heuristics, "_HAS_PCRE2", False)
+        pattern = heuristics._compile(r"classe\s*(\d)", re.IGNORECASE)
+
+        assert isinstance(pattern, re.Pattern)
+        assert pattern.search("CLASSE 3").group(1) == "3"
+
+    def test_missing_pcre2_flag_falls_back_to_re(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a binding without a flag constant falls back to ``re``."""
+        stub = SimpleNamespace(IGNORECASE=2, compile=lambda *args, **kwargs: pytest.fail("compiled"))
+        monkeypatch.setattr(heuristics, "_HAS_PCRE2", True)
+        monkeypatch.setattr(heuristics, "pcre2", stub)
+        pattern = heuristics._compile(r"classe \s* (\d)", re.IGNORECASE | re.VERBOSE)
+
+        assert isinstance(pattern, re.Pattern)
+        assert pattern.search("CLASSE 3").group(1) == "3"
+
+    def test_pcre2_matches_re(self) -> None:
+        """Test that the PCRE2 backend returns the same spans as ``re``."""
+        pytest.importorskip("pcre2")
+        text = "Transporte: UN 1230, Classe 3 - Nome do produto: Metanol"
+        fast = heuristics._compile(HeuristicExtractor.ONU_PATTERN.pattern, re.IGNORECASE | re.VERBOSE)
+        slow = re.compile(HeuristicExtractor.ONU_PATTERN.pattern, re.IGNORECASE | re.VERBOSE)
+
+        assert [m.span() for m in fast.finditer(text)] == [m.span() for m in slow.finditer(text)]
@@ -7,10 +7,22 @@ import pytest
 from src.core.heuristics import HeuristicExtractor
 from src.core.validator import Fabricante, GrupoEmbalagem, NomeProduto
 
-@pytest.fixture
-def extractor() -> HeuristicExtractor:
-    """Create a fresh HeuristicExtractor instance for testing."""
-    return HeuristicExtractor()
+_FULL_FDS_TEXT = """
+    FICHA DE DADOS DE SEGURANÇA
+
+    1. Identificação do Produto e da Empresa
+    Produto: ETANOL 95% - ÁLCOOL ETÍLICO
+    Fabricante: Acme Chemicals Ltda
+
+    3. Composição e Informações sobre os Ingredientes
+    CAS: 64-17-5
+    Concentração: 95%
+
+    14. Informações sobre Transporte
+    Número ONU: 1170
+    Classe de risco 3
+    Grupo de embalagem: II
+    """
 
 class TestNomeProduto:
     """Test suite for product name extraction."""
@@ -211,24 +223,7 @@ class TestFullExtractionWithNewFields:
 
     def test_extract_all_fields_including_new(self, extractor: HeuristicExtractor) -> None:
         """Test extraction of all fields from complete FDS text."""
-        text = """
-        FICHA DE DADOS DE SEGURANÇA
-        
-        1. Identificação do Produto e da Empresa
-        Produto: ETANOL 95% - ÁLCOOL ETÍLICO
-        Fabricante: Acme Chemicals Ltda
-        
-        3. Composição e Informações sobre os Ingredientes
-        CAS: 64-17-5
-        Concentração: 95%
-        
-        14. Informações sobre Transporte
-        Número ONU: 1170
-        Classe de risco 3
-        Grupo de embalagem: II
-        """
-        
-        results = extractor.extract(text=text, sections=None)
+        results = extractor.extract(text=_FULL_FDS_TEXT, sections=None)
         
         # Original fields
         assert "numero_onu" in results
@@ -11,170 +11,228 @@ This test suite validates:
 """
 
 import json
-import time
-from unittest.mock import AsyncMock, Mock, patch
+import random
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 from src.core.searxng_client import SearXNGClient, TokenBucket
 
-# ===== Mock HTTP Client =====
-class _MockHTTPClient:
-    """Mock HTTP client for testing SearXNG requests."""
-
-    def __init__(self, responses: list[dict] | None = None):
-        """
-        Initialize mock client with predefined responses.
-
-        Args:
-            responses: list of response dicts with keys:
-                - status_code: HTTP status (default 200)
-                - json_data: dict to return from .json()
-                - text: Text to return from .text (default "")
-                - raise_error: Exception to raise (optional)
-        """
-        self.responses = responses or []
-        self.call_count = 0
-        self.calls = []  # Track all calls
-
-    def get(self, url: str, params: dict | None = None, **kwargs):
-        """Mock GET request."""
-        self.calls.append({
-            "url": url,
-            "params": params,
-            "headers": kwargs.get("headers")
-        })
-
-        if self.call_count >= len(self.responses):
-            # Default success response if no more mocked responses
-            response = Mock()
-            response.status_code = 200
-            response.json.return_value = {"results": []}
-            response.text = ""
-            self.call_count += 1
-            return response
-
-        resp_config = self.responses[self.call_count]
-        self.call_count += 1
-
-        # Raise error if configured
-        if "raise_error" in resp_config:
-            raise resp_config["raise_error"]
-
-        # Create mock response
-        response = Mock()
-        response.status_code = resp_config.get("status_code", 200)
-        response.json.return_value = resp_config.get("json_data", {})
-        response.text = resp_config.get("text", "")
-        response.raise_for_status = Mock()
-
-        return response
+from .conftest import EMPTY_RESULTS, FakeResponse, MockHTTPClient
+
+# ===== Mock HTTP Responses =====
+def _results(url: str, title: str, content: str) -> dict:
+    return {"results": [{"url": url, "title": title, "content": content}]}
+
+# Shared, immutable responses reused by every test
+_OK_ONE_RESULT = FakeResponse(json_data=_results("https://example.com", "Test", "Content"))
+_OK_SECOND_RESULT = FakeResponse(
+    json_data=_results("https://example2.com", "Test2", "Content2")
+)
+_OK_MANUFACTURER = FakeResponse(
+    json_data=_results("https://example.com", "Test", "Manufacturer: ACME Corp")
+)
+_OK_MANUFACTURER_LOCATION = FakeResponse(
+    json_data=_results(
+        "https://example.com", "Test", "Manufacturer: ACME | Location: Building A"
+    )
+)
+_OK_PRODUCT_PAGE = FakeResponse(
+    json_data=_results("https://example.com/product", "Fire Extinguisher", "")
+)
+_TOO_MANY_REQUESTS = FakeResponse(status_code=429)
+_SERVICE_UNAVAILABLE = FakeResponse(status_code=503)
+
+# Cache rows seeded into the persisted cache file, serialised once
+_PERSISTED_QUERY = "Benzeno manufacturer safety data sheet"
+_PERSIST_ROWS = [
+    (key, query, json.dumps(data))
+    for key, query, data in (
+        (
+            SearXNGClient._cache_key(_PERSISTED_QUERY, 3),
+            _PERSISTED_QUERY,
+            [{"title": "Benzeno FDS", "url": "https://example.com", "snippet": "ACME Corp"}],
+        ),
+        ("test_query_location", "test query", [{"location": "Building A"}]),
+        ("test_query_empty", "test query", []),
+    )
+]
+
+_CRAWL_RESULT = SimpleNamespace(
+    success=True,
+    markdown=SimpleNamespace(fit_markdown="# Product\nManufacturer: ACME Corp"),
+)
+
+class _StubCrawler:
+    """Async stand-in for ``crawl4ai.AsyncWebCrawler`` that counts crawls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def arun(self, *args, **kwargs):
+        self.calls += 1
+        return _CRAWL_RESULT
 
 # ===== Token Bucket Tests =====
-def test_token_bucket_initialization():
+@pytest.fixture
+def fake_clock():
+    """Controllable nanosecond clock; advance it by mutating ``[0]``."""
+    return [1_000_000_000]
+
+@pytest.fixture
+def make_bucket(fake_clock):
+    """Factory for TokenBuckets driven by ``fake_clock``."""
+    def factory(capacity=5, tokens=5, rate=2.0):
+        return TokenBucket(
+            capacity=capacity,
+            tokens=tokens,
+            rate=rate,
+            clock=lambda: fake_clock[0]
+        )
+
+    return factory
+
+def test_token_bucket_initialization(make_bucket):
     """Test TokenBucket initializes with correct capacity and rate."""
-    bucket = TokenBucket(
-        capacity=5,
-        tokens=5,
-        rate=2.0,
-        last_update=time.time()
-    )
+    bucket = make_bucket()
 
     assert bucket.capacity == 5
     assert bucket.rate == 2.0
     assert bucket.tokens == 5  # Starts full
 
-def test_token_bucket_consume_success():
-    """Test successful token consumption."""
-    bucket = TokenBucket(
-        capacity=5,
-        tokens=5,
-        rate=2.0,
-        last_update=time.time()
-    )
-
-    assert bucket.consume() is True
-    assert bucket.tokens == 4
-
-    # Consume all remaining tokens
-    for _ in range(4):
+@pytest.mark.parametrize(
+    "capacity,tokens,expected_consumes",
+    [
+        (5, 5, 5),  # Full bucket drains one token at a time
+        (1, 1, 1),  # Single token
+        (5, 0, 0),  # Empty bucket
+        (5, 2.5, 2),  # Fractional remainder is not enough for a token
+    ],
+)
+def test_token_bucket_consume(make_bucket, capacity, tokens, expected_consumes):
+    """Test consume() succeeds until the bucket is empty, then fails."""
+    bucket = make_bucket(capacity=capacity, tokens=tokens)
+
+    for remaining in range(expected_consumes, 0, -1):
         assert bucket.consume() is True
+        assert bucket.tokens == tokens - (expected_consumes - remaining) - 1
 
-    assert bucket.tokens <= 1e-4  # Allow floating point rounding error
+    assert bucket.consume() is False  # No whole token left
 
-def test_token_bucket_consume_failure():
-    """Test token consumption fails when bucket is empty."""
-    bucket = TokenBucket(
-        capacity=1,
-        tokens=1,
-        rate=2.0,
-        last_update=time.time()
-    )
-
-    assert bucket.consume() is True  # Take the only token
-    assert bucket.consume() is False  # No tokens left
-
-def test_token_bucket_refill():
+def test_token_bucket_refill(make_bucket, fake_clock):
     """Test tokens refill over time."""
-    bucket = TokenBucket(
-        capacity=5,
-        tokens=5,
-        rate=2.0,
-        last_update=time.time()
-    )
+    bucket = make_bucket()
 
     # Drain bucket
     for _ in range(5):
         bucket.consume()
-    assert bucket.tokens <= 1e-4  # Allow floating point rounding error
+    assert bucket.tokens == 0
 
-    # Wait 0.5 seconds (should refill 1 token: 2 tokens/sec × 0.5s)
-    time.sleep(0.5)
+    # Advance 0.5 seconds (should refill 1 token: 2 tokens/sec × 0.5s)
+    fake_clock[0] += 500_000_000
     bucket._refill()
-    assert bucket.tokens >= 0.9  # Allow slight timing variance
+    assert bucket.tokens == 1
 
-def test_token_bucket_wait_time():
+    # Refill never exceeds capacity
+    fake_clock[0] += 60 * 1_000_000_000
+    bucket._refill()
+    assert bucket.tokens == 5
+
+@pytest.mark.parametrize(
+    "tokens,elapsed_ns,expected_wait",
+    [
+        (5, 0, 0.0),  # Full bucket: no wait
+        (0, 0, 0.5),  # Empty bucket: 1 token at 2 tokens/sec
+        (0, 250_000_000, 0.25),  # Half the wait has elapsed
+        (0.5, 0, 0.25),  # Half a token already available
+    ],
+)
+def test_token_bucket_wait_time(make_bucket, fake_clock, tokens, elapsed_ns, expected_wait):
     """Test wait_time() calculates correct delay."""
-    bucket = TokenBucket(
-        capacity=5,
-        tokens=5,
-        rate=2.0,
-        last_update=time.time()
-    )
+    bucket = make_bucket(tokens=tokens)
+    fake_clock[0] += elapsed_ns
 
-    # Full bucket: no wait
-    assert bucket.wait_time() == 0.0
+    assert bucket.wait_time() == expected_wait
 
-    # Drain bucket
-    for _ in range(5):
-        bucket.consume()
+# ===== SearXNG Client Tests =====
+def _set_env(monkeypatch, **overrides: str) -> None:
+    """Set several environment variables, undone at test teardown."""
+    for key, value in overrides.items():
+        monkeypatch.setenv(key, value)
 
-    # Empty bucket: wait for 1 token (0.5 seconds at 2 tokens/sec)
-    wait = bucket.wait_time()
-    assert 0.4 <= wait <= 0.6  # Allow timing variance
+@pytest.fixture
+def sleeps() -> list[float]:
+    """Delays requested by clients from ``searxng_factory``, in order."""
+    return []
 
-# ===== SearXNG Client Tests =====
 @pytest.fixture
-def temp_cache_dir(tmp_path):
-    """Provide temporary cache directory for tests."""
-    cache_dir = tmp_path / "cache"
-    cache_dir.mkdir()
-    return str(cache_dir)
+def searxng_factory(sleeps, fake_clock):
+    """Build SearXNGClients with an in-memory cache, ``fake_clock`` and recorded sleeps."""
+    defaults = {
+        "cache_db_path": ":memory:",
+        "sleep": sleeps.append,
+        "clock": lambda: fake_clock[0],
+    }
+    return lambda **kwargs: SearXNGClient(**{**defaults, **kwargs})
+
+@pytest.fixture(scope="session")
+def searxng_db_template(tmp_path_factory) -> Path:
+    """Cache DB whose schema is created once and copied into each test."""
+    path = tmp_path_factory.mktemp("tpl") / "tpl.db"
+    client = SearXNGClient(cache_enabled=True, cache_db_path=str(path))
+    client._cache_conn.close()
+    return path
+
+@pytest.fixture(scope="session")
+def prepopulated_cache_db(searxng_db_template, tmp_path_factory) -> str:
+    """Cache file holding ``_PERSIST_ROWS``, written with plain DuckDB SQL."""
+    duckdb = pytest.importorskip("duckdb")
+    path = tmp_path_factory.mktemp("persisted") / "cache.db"
+    shutil.copyfile(searxng_db_template, path)
+    conn = duckdb.connect(str(path))
+    conn.executemany(
+        "INSERT INTO search_cache (key, query, results) VALUES (?, ?, ?)",
+        _PERSIST_ROWS,
+    )
+    conn.close()
+    return str(path)
+
+@pytest.fixture(scope="module")
+def rotation_client():
+    """Cache-less client shared by the pure rotation tests."""
+    return SearXNGClient(
+        instances=[
+            "https://searx1.example.com",
+            "https://searx2.example.com",
+            "https://searx3.example.com",
+        ],
+        cache_enabled=False,
+    )
 
-def test_searxng_client_initialization(temp_cache_dir, monkeypatch):
+def test_searxng_client_initialization(searxng_factory, monkeypatch):
     """Test SearXNGClient initializes correctly with config."""
     # set environment variables for configuration
-    monkeypatch.setenv("SEARXNG_INSTANCES", "https://searx.example.com")
-    monkeypatch.setenv("SEARXNG_RATE_LIMIT", "2.0")
-    monkeypatch.setenv("SEARXNG_BURST_LIMIT", "5.0")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "1.0")
-    monkeypatch.setenv("SEARXNG_MAX_RETRIES", "3")
-    monkeypatch.setenv("SEARXNG_BACKOFF", "2.0")
-    monkeypatch.setenv("SEARXNG_TIMEOUT", "30")
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-    monkeypatch.setenv("SEARXNG_CACHE", "1")
-
-    client = SearXNGClient()
+    _set_env(
+        monkeypatch,
+        SEARXNG_INSTANCES="https://searx.example.com",
+        SEARXNG_RATE_LIMIT="2.0",
+        SEARXNG_BURST_LIMIT="5.0",
+        SEARXNG_MIN_DELAY="1.0",
+        SEARXNG_MAX_RETRIES="3",
+        SEARXNG_BACKOFF="2.0",
+        SEARXNG_TIMEOUT="30",
+        SEARXNG_CACHE="1",
+    )
+
+    client = searxng_factory()
 
     assert "searx.example.com" in client.instances[0]
     assert client.rate_limiter.capacity == 5.0
@@ -182,124 +240,107 @@ def test_searxng_client_initialization(temp_cache_dir, monkeypatch):
     assert client.min_request_delay == 1.0
     assert client.max_retries == 3
 
-def test_searxng_client_user_agent_rotation():
-    """Test user-agent rotation cycles through configured agents."""
-    client = SearXNGClient()
+def test_searxng_client_kwargs_override_env(searxng_factory, monkeypatch):
+    """Test constructor arguments take precedence over environment variables."""
+    _set_env(
+        monkeypatch,
+        SEARXNG_INSTANCES="https://env.example.com",
+        SEARXNG_RATE_LIMIT="9.0",
+        SEARXNG_MIN_DELAY="9.0",
+        SEARXNG_MAX_RETRIES="9",
+        SEARXNG_CACHE="1",
+    )
 
-    # Get 5 user agents (should cycle through 4 UAs)
-    agents = [client._get_user_agent() for _ in range(5)]
+    client = searxng_factory(
+        instances=["https://kwarg.example.com"],
+        rate_limit=1.5,
+        min_delay=0.0,
+        max_retries=0,
+        cache_enabled=False,
+    )
 
-    # Should have at least 2 different UAs (4 total in rotation)
-    assert len(set(agents)) >= 2
+    assert client.instances == ["https://kwarg.example.com"]
+    assert client.rate_limiter.rate == 1.5
+    assert client.min_request_delay == 0.0
+    assert client.max_retries == 0
+    assert client.cache_enabled is False
+    assert client._cache_conn is None
 
-def test_searxng_client_instance_rotation(monkeypatch):
-    """Test instance rotation cycles through configured instances."""
-    monkeypatch.setenv(
-        "SEARXNG_INSTANCES",
-        "https://searx1.example.com,https://searx2.example.com,https://searx3.example.com"
-    )
-    client = SearXNGClient()
+def test_searxng_client_user_agent_rotation(rotation_client, monkeypatch):
+    """Test user agents are drawn from the configured pool with random.choice."""
+    pool = SearXNGClient.USER_AGENTS
+    # Deterministic stand-in for random.choice: walk the pool in order
+    picks = iter(range(5))
+    monkeypatch.setattr(random, "choice", lambda seq: seq[next(picks) % len(seq)])
+
+    agents = [rotation_client._get_user_agent() for _ in range(5)]
+
+    assert agents == [pool[i % len(pool)] for i in range(5)]
 
+def test_searxng_client_instance_rotation(rotation_client):
+    """Test instance rotation cycles through configured instances."""
     # Get 4 instances (should cycle)
-    instances = [client._get_instance() for _ in range(4)]
+    instances = [rotation_client._get_instance() for _ in range(4)]
 
     # Should cycle through all 3 instances
     assert instances[0] != instances[1]  # Different instances
     assert instances[0] == instances[3]  # Cycled back to first
 
-def test_searxng_rate_limiting(temp_cache_dir, monkeypatch):
+def test_searxng_rate_limiting(searxng_factory, sleeps, fake_clock):
     """Test rate limiting enforces min_delay between requests."""
     # Mock successful response
-    mock_http_client = _MockHTTPClient(
-        responses=[
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com",
-                        "title": "Test",
-                        "content": "Content"
-                    }]
-                }
-            },
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example2.com",
-                        "title": "Test2",
-                        "content": "Content2"
-                    }]
-                }
-            },
-        ]
-    )
-
-    # Configure via environment
-    monkeypatch.setenv("SEARXNG_RATE_LIMIT", "2.0")  # 2 req/sec
-    monkeypatch.setenv("SEARXNG_BURST_LIMIT", "5.0")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.5")  # 500ms min delay
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
+    mock_http_client = MockHTTPClient(responses=[_OK_ONE_RESULT, _OK_SECOND_RESULT])
 
     # Inject mock HTTP client
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
+        return mock_http_client
 
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        rate_limit=2.0,  # 2 req/sec
+        burst_limit=5.0,
+        min_delay=0.5,  # 500ms min delay
+    )
 
-    # First request
-    start = time.time()
+    # First request (no previous request, no delay)
     client.search_online_for_missing_fields(
         product_name="Fire extinguisher",
         missing_fields=["manufacturer"],
     )
+    assert sleeps == []
 
-    # Second request (should be delayed)
+    # Second request (should be delayed by the rest of min_delay)
     client.search_online_for_missing_fields(
         product_name="Fire alarm",
         missing_fields=["location"],
     )
-    elapsed = time.time() - start
 
-    # Should take at least min_delay (500ms)
-    assert elapsed >= 0.5, f"Rate limit not enforced: {elapsed}s < 0.5s"
+    # The clock did not move, so the whole min_delay is waited out
+    assert sleeps == [0.5], f"Rate limit not enforced: slept {sleeps}"
+
+    # Time already elapsed since the last request counts towards min_delay
+    fake_clock[0] += 200_000_000
+    client.search_online_for_missing_fields(
+        product_name="Fire blanket",
+        missing_fields=["manufacturer"],
+    )
+    assert sleeps[1] == pytest.approx(0.3)
 
 
-@pytest.mark.xfail(reason="Timing-sensitive retry logic test")
-def test_searxng_retry_on_429(temp_cache_dir, monkeypatch):
+def test_searxng_retry_on_429(searxng_factory, sleeps):
     """Test retry logic handles 429 (rate limit) errors."""
     # Mock 429 error then success
-    mock_http_client = _MockHTTPClient(
-        responses=[
-            {"status_code": 429, "json_data": {}},  # First attempt fails
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com",
-                        "title": "Test",
-                        "content": "Content"
-                    }]
-                }
-            },
-        ]
-    )
-
-    monkeypatch.setenv("SEARXNG_MAX_RETRIES", "3")
-    monkeypatch.setenv("SEARXNG_BACKOFF", "0.1")  # Fast backoff for testing
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")  # Disable delay for speed
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
+    mock_http_client = MockHTTPClient(responses=[_TOO_MANY_REQUESTS, _OK_ONE_RESULT])
 
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
+        return mock_http_client
 
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        max_retries=3,
+        backoff=0.1,  # Fast backoff for testing
+        min_delay=0.0,  # Disable delay for speed
+    )
 
     # Should succeed after retry
     result = client.search_online_for_missing_fields(
@@ -307,46 +348,31 @@ def test_searxng_retry_on_429(temp_cache_dir, monkeypatch):
         missing_fields=["manufacturer"],
     )
 
-    assert result is not None
+    assert result["manufacturer"]["value"] == "Content"
     assert mock_http_client.call_count == 2  # Initial + 1 retry
+    assert len(sleeps) == 1  # One backoff, no real waiting
 
 
-@pytest.mark.xfail(reason="Instance failover logic test - timing/mock setup")
-def test_searxng_instance_failover(temp_cache_dir, monkeypatch):
+@pytest.mark.xfail(
+    run=False,
+    reason="_get_instance also advances past never-healthy instances, so with two "
+    "instances the retry lands on the same one",
+)
+def test_searxng_instance_failover(searxng_factory):
     """Test multi-instance failover on consecutive errors."""
     # Mock instance 1 fails, instance 2 succeeds
-    mock_http_client = _MockHTTPClient(
-        responses=[
-            {"status_code": 503, "json_data": {}},  # Instance 1 fails
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com",
-                        "title": "Test",
-                        "content": "Content"
-                    }]
-                }
-            },
-        ]
-    )
-
-    monkeypatch.setenv(
-        "SEARXNG_INSTANCES",
-        "https://searx1.example.com,https://searx2.example.com"
-    )
-    monkeypatch.setenv("SEARXNG_MAX_RETRIES", "2")
-    monkeypatch.setenv("SEARXNG_BACKOFF", "0.1")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
+    mock_http_client = MockHTTPClient(responses=[_SERVICE_UNAVAILABLE, _OK_ONE_RESULT])
 
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
-
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+        return mock_http_client
+
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        instances=["https://searx1.example.com", "https://searx2.example.com"],
+        max_retries=2,
+        backoff=0.1,
+        min_delay=0.0,
+    )
 
     result = client.search_online_for_missing_fields(
         product_name="Fire extinguisher",
@@ -357,37 +383,21 @@ def test_searxng_instance_failover(temp_cache_dir, monkeypatch):
     # Should have tried 2 instances
     assert mock_http_client.call_count == 2
     # Second call should use different instance
-    assert mock_http_client.calls[0]["url"] != mock_http_client.calls[1]["url"]
+    assert mock_http_client.calls[0][0] != mock_http_client.calls[1][0]
 
-def test_searxng_search_cache_hit(temp_cache_dir, monkeypatch):
+def test_searxng_search_cache_hit(searxng_factory):
     """Test search cache prevents duplicate requests."""
-    mock_http_client = _MockHTTPClient(
-        responses=[
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com",
-                        "title": "Test",
-                        "content": "Manufacturer: ACME Corp"
-                    }]
-                }
-            },
-        ]
-    )
-
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-    monkeypatch.setenv("SEARXNG_CACHE", "1")
-    monkeypatch.setenv("SEARXNG_CACHE_TTL", "3600")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")
+    mock_http_client = MockHTTPClient(responses=[_OK_MANUFACTURER])
 
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
+        return mock_http_client
 
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        cache_enabled=True,
+        cache_ttl=3600,
+        min_delay=0.0,
+    )
 
     # First request (cache miss)
     result1 = client.search_online_for_missing_fields(
@@ -405,211 +415,174 @@ def test_searxng_search_cache_hit(temp_cache_dir, monkeypatch):
     assert mock_http_client.call_count == 1
     assert result1 == result2
 
-@pytest.mark.xfail(reason="Config reload timing - crawl4ai test mock setup")
-def test_searxng_crawl_cache_hit(temp_cache_dir, monkeypatch):
+def test_searxng_search_cache_seeded_hit(searxng_factory):
+    """Test a pre-seeded search cache entry is served without any request."""
+    mock_http_client = MockHTTPClient()
+    client = searxng_factory(
+        http_client_factory=lambda timeout: mock_http_client,
+        cache_enabled=True,
+    )
+    query = "Fire extinguisher manufacturer safety data sheet"
+    client._store_cached_search(
+        client._cache_key(query, 3),
+        query,
+        [{"title": "Cached", "url": "https://example.com", "snippet": "Cache answer"}],
+    )
+
+    result = client.search_online_for_missing_fields(
+        product_name="Fire extinguisher",
+        missing_fields=["fabricante"],
+    )
+
+    assert result["fabricante"]["value"] == "Cache answer"
+    assert result["fabricante"]["context"] == "SearXNG: Cached"
+    assert mock_http_client.call_count == 0
+
+def test_searxng_crawl_cache_hit(searxng_factory, monkeypatch):
     """Test crawl cache prevents duplicate URL fetches."""
     # Skip if crawl4ai not available
     pytest.importorskip("crawl4ai")
     
     # Mock search response
-    mock_search_client = _MockHTTPClient(
-        responses=[
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com/product",
-                        "title": "Fire Extinguisher",
-                        "content": ""
-                    }]
-                }
-            },
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com/product",
-                        "title": "Fire Extinguisher",
-                        "content": ""
-                    }]
-                }
-            },
-        ]
-    )
-
-    # Mock crawler response
-    with patch("crawl4ai.AsyncWebCrawler"):
-        mock_crawler_instance = AsyncMock()
-        mock_result = Mock()
-        mock_result.success = True
-        mock_result.markdown = Mock()
-        mock_result.markdown.fit_markdown = "# Product\nManufacturer: ACME Corp"
-        mock_crawler_instance.arun.return_value = mock_result
-
-        monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-        monkeypatch.setenv("SEARXNG_CACHE", "1")
-        monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")
-        monkeypatch.setenv("CRAWL4AI_ENABLED", "1")  # Enable Crawl4AI for test
-
-        def mock_client_factory(timeout):
-            mock = Mock()
-            mock.__enter__ = Mock(return_value=mock_search_client)
-            mock.__exit__ = Mock(return_value=False)
-            return mock
-
-        client = SearXNGClient(http_client_factory=mock_client_factory)
-
-        # First request (crawl cache miss)
-        result1 = client.search_online_for_missing_fields(
-            product_name="Fire extinguisher",
-            missing_fields=["manufacturer"],
-        )
+    mock_search_client = MockHTTPClient(responses=[_OK_PRODUCT_PAGE, _OK_PRODUCT_PAGE])
 
-        # Second request (same URL, should hit crawl cache)
-        result2 = client.search_online_for_missing_fields(
-            product_name="Fire extinguisher",
-            missing_fields=["manufacturer"],
-        )
+    # Stub crawler response
+    crawler = _StubCrawler()
+    monkeypatch.setattr("crawl4ai.AsyncWebCrawler", lambda **kwargs: crawler)
 
-        # Should only crawl URL once (second is cached)
-        assert mock_crawler_instance.arun.call_count == 1
-        assert "ACME Corp" in str(result1.get("manufacturer", ""))
-        assert result1 == result2
+    monkeypatch.setenv("SEARXNG_CRAWL", "1")  # Crawl the top result for this test
 
+    def mock_client_factory(timeout):
+        return mock_search_client
 
-@pytest.mark.xfail(reason="Empty results handling - mock setup")
-def test_searxng_empty_results(temp_cache_dir, monkeypatch):
-    """Test graceful handling of empty search results."""
-    mock_http_client = _MockHTTPClient(
-        responses=[{"status_code": 200, "json_data": {"results": []}}]
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        cache_enabled=True,
+        min_delay=0.0,
     )
 
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")
+    # First request (crawl cache miss)
+    result1 = client.search_online_for_missing_fields(
+        product_name="Fire extinguisher",
+        missing_fields=["manufacturer"],
+    )
+
+    # Second request (same URL, should hit crawl cache)
+    result2 = client.search_online_for_missing_fields(
+        product_name="Fire extinguisher",
+        missing_fields=["manufacturer"],
+    )
+
+    # Should only crawl URL once (second is cached)
+    assert crawler.calls == 1
+    assert "ACME Corp" in str(result1.get("manufacturer", ""))
+    assert result1 == result2
+
+
+def test_searxng_empty_results(searxng_factory):
+    """Test graceful handling of empty search results."""
+    mock_http_client = MockHTTPClient(responses=[EMPTY_RESULTS])
 
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
+        return mock_http_client
 
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        min_delay=0.0,
+    )
 
     result = client.search_online_for_missing_fields(
         product_name="Nonexistent product",
         missing_fields=["manufacturer"],
     )
 
-    # Should return empty dict (no fields found)
-    assert result == {}
+    # Field is reported as not found after a single search
+    assert result["manufacturer"]["value"] == "NAO ENCONTRADO"
+    assert result["manufacturer"]["confidence"] == 0.0
+    assert mock_http_client.call_count == 1
 
 
-@pytest.mark.xfail(reason="Max retries exhaustion - mock setup")
-def test_searxng_max_retries_exhausted(temp_cache_dir, monkeypatch):
+def test_searxng_max_retries_exhausted(searxng_factory, sleeps):
     """Test graceful failure when max retries exceeded."""
     # Mock all attempts fail with 503
-    mock_http_client = _MockHTTPClient(
-        responses=[
-            {"status_code": 503, "json_data": {}},
-            {"status_code": 503, "json_data": {}},
-            {"status_code": 503, "json_data": {}},
-        ]
+    mock_http_client = MockHTTPClient(
+        responses=[_SERVICE_UNAVAILABLE, _SERVICE_UNAVAILABLE, _SERVICE_UNAVAILABLE]
     )
 
-    monkeypatch.setenv("SEARXNG_MAX_RETRIES", "2")
-    monkeypatch.setenv("SEARXNG_BACKOFF", "0.1")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
+        return mock_http_client
 
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        max_retries=2,
+        backoff=0.1,
+        min_delay=0.0,
+    )
 
     result = client.search_online_for_missing_fields(
         product_name="Fire extinguisher",
         missing_fields=["manufacturer"],
     )
 
-    # Should return empty dict after exhausting retries
-    assert result == {}
+    # Field is reported as an error once retries are exhausted
+    assert result["manufacturer"]["value"] == "ERRO"
+    assert result["manufacturer"]["confidence"] == 0.0
     # Should have tried max_retries + 1 times (initial + 2 retries)
     assert mock_http_client.call_count == 3
+    # Exponential backoff (0.1s, 0.2s) plus up to 1s of jitter between attempts
+    assert len(sleeps) == 2
+    assert 0.1 <= sleeps[0] <= 1.1
+    assert 0.2 <= sleeps[1] <= 1.2
 
 
-@pytest.mark.xfail(reason="Batch search - mock setup")
-def test_searxng_batch_search(temp_cache_dir, monkeypatch):
-    """Test batch search for multiple fields."""
-    mock_http_client = _MockHTTPClient(
-        responses=[
-            {
-                "status_code": 200,
-                "json_data": {
-                    "results": [{
-                        "url": "https://example.com",
-                        "title": "Test",
-                        "content": "Manufacturer: ACME | Location: Building A"
-                    }]
-                }
-            },
-        ]
-    )
-
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-    monkeypatch.setenv("SEARXNG_MIN_DELAY", "0.0")
+def test_searxng_batch_search(searxng_factory):
+    """Test each missing field gets its own search."""
+    mock_http_client = MockHTTPClient(responses=[_OK_MANUFACTURER_LOCATION])
 
     def mock_client_factory(timeout):
-        mock = Mock()
-        mock.__enter__ = Mock(return_value=mock_http_client)
-        mock.__exit__ = Mock(return_value=False)
-        return mock
+        return mock_http_client
 
-    client = SearXNGClient(http_client_factory=mock_client_factory)
+    client = searxng_factory(
+        http_client_factory=mock_client_factory,
+        min_delay=0.0,
+    )
 
     result = client.search_online_for_missing_fields(
         product_name="Fire extinguisher",
         missing_fields=["manufacturer", "location"],
     )
 
-    # Should extract both fields from single search
-    assert "manufacturer" in result or "location" in result
-    # Only 1 search request for multiple fields
-    assert mock_http_client.call_count == 1
+    # One search request per field; the second gets no results
+    assert mock_http_client.call_count == 2
+    assert "ACME" in result["manufacturer"]["value"]
+    assert result["location"]["value"] == "NAO ENCONTRADO"
+
+def test_searxng_cache_persistence(prepopulated_cache_db):
+    """Test a new client serves results persisted by an earlier process."""
+    mock_http_client = MockHTTPClient()
+    client = SearXNGClient(
+        http_client_factory=lambda timeout: mock_http_client,
+        cache_enabled=True,
+        cache_db_path=prepopulated_cache_db,
+        sleep=lambda seconds: None,
+    )
+    assert client._cache_conn is not None
 
-def test_searxng_cache_persistence(temp_cache_dir, monkeypatch):
-    """Test cache persists across client instances."""
-    monkeypatch.setenv("SEARXNG_CACHE_DB_PATH", f"{temp_cache_dir}/test.db")
-    monkeypatch.setenv("SEARXNG_CACHE", "1")
-
-    # Create first client and populate cache
-    client1 = SearXNGClient()
-    cache_key = "test_query_manufacturer"
-    test_data = {"manufacturer": "ACME Corp"}
-
-    # Manually insert into cache
-    if client1._cache_conn:
-        client1._cache_conn.execute(
-            """
-            INSERT INTO search_cache (key, query, results)
-            VALUES (?, ?, ?)
-            """,
-            (cache_key, "test query", json.dumps([test_data])),
-        )
-        client1._cache_conn.commit()
+    # Every persisted row is readable as stored
+    for cache_key, _query, payload in _PERSIST_ROWS:
+        row = client._cache_conn.execute(
+            "SELECT results FROM search_cache WHERE key = ?",
+            (cache_key,),
+        ).fetchone()
 
-        # Create second client (should load existing cache)
-        client2 = SearXNGClient()
+        assert row is not None
+        assert row[0] == payload
 
-        # Query cache
-        if client2._cache_conn:
-            row = client2._cache_conn.execute(
-                "SELECT results FROM search_cache WHERE key = ?",
-                (cache_key,),
-            ).fetchone()
+    # A matching search is answered from the file without any request
+    result = client.search_online_for_missing_fields(
+        product_name="Benzeno",
+        missing_fields=["fabricante"],
+    )
 
-            assert row is not None
-            cached_data = json.loads(row[0])
-            assert cached_data == [test_data]
+    assert result["fabricante"]["value"] == "ACME Corp"
+    assert mock_http_client.call_count == 0
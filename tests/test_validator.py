@@ -2,14 +2,39 @@
 
 from __future__ import annotations
 
+import os
+from importlib.machinery import EXTENSION_SUFFIXES
+
 import pytest
 from pydantic import ValidationError
 
+from src.core import validator
 from src.core.validator import (
     ClassificacaoONU,
     NumeroCAS,
     NumeroONU,
+    _NumeroONUCore,
     validate_field,
+    validate_field_many,
+)
+
+_VALID_CLASSES = (
+    "1", "1.1", "1.2", "1.3", "1.4", "1.5", "1.6",
+    "2.1", "2.2", "2.3",
+    "3",
+    "4.1", "4.2", "4.3",
+    "5.1", "5.2",
+    "6.1", "6.2",
+    "7", "8", "9",
+)
+
+# Standard, longest and shortest-group CAS formats
+_VALID_CAS = ("64-19-7", "1234567-89-0", "50-00-0")
+
+_VALID_FIELD_PAYLOADS = (
+    ("numero_onu", {"value": "1234", "confidence": 0.95}),
+    ("numero_cas", {"value": "64-19-7", "confidence": 0.95}),
+    ("classificacao_onu", {"value": "3", "confidence": 0.95}),
 )
 
 class TestNumeroONUValidator:
@@ -51,6 +76,14 @@ class TestNumeroONUValidator:
         with pytest.raises(ValidationError, match="4 digitos"):
             NumeroONU(value="12345", confidence=0.9)
 
+        # Superscripts are digits to str.isdigit but not to int()
+        with pytest.raises(ValidationError, match="4 digitos"):
+            NumeroONU(value="12³4", confidence=0.9)
+
+        # Non-ASCII decimal digits are rejected as a format error
+        with pytest.raises(ValidationError, match="4 digitos"):
+            NumeroONU(value="١٢٣٤", confidence=0.9)
+
     def test_invalid_range(self) -> None:
         """Test validation rejects out-of-range numbers."""
         with pytest.raises(ValidationError, match="intervalo valido"):
@@ -67,22 +100,37 @@ class TestNumeroONUValidator:
         with pytest.raises(ValidationError):
             NumeroONU(value="1234", confidence=1.1)
 
+    def test_frozen(self) -> None:
+        """Test validated results cannot be mutated after validation."""
+        result = NumeroONU(value="1234", confidence=0.9)
+        with pytest.raises(ValidationError):
+            result.value = "9999"
+        assert result.value == "1234"
+
+    def test_try_validate(self) -> None:
+        """Test try_validate grades payloads without raising."""
+        assert _NumeroONUCore.try_validate({"value": "UN 1234", "confidence": 0.95}) == (
+            "valid", None,
+        )
+        assert _NumeroONUCore.try_validate({"value": "1234", "confidence": 0.8}) == (
+            "warning", None,
+        )
+        assert _NumeroONUCore.try_validate({"value": "9999", "confidence": 0.95}) == (
+            "invalid", "Numero ONU fora do intervalo valido.",
+        )
+        assert _NumeroONUCore.try_validate({"value": "1234", "confidence": 1.5}) == (
+            "invalid", "Confianca deve estar entre 0 e 1.",
+        )
+        assert _NumeroONUCore.try_validate_fields("UN 1234", 0.95) == ("valid", None)
+
 class TestNumeroCASValidator:
     """Test suite for CAS number validation."""
 
-    def test_valid_cas_formats(self) -> None:
+    @pytest.mark.parametrize("cas_value", _VALID_CAS)
+    def test_valid_cas_formats(self, cas_value: str) -> None:
         """Test various valid CAS formats."""
-        # Standard 5-2-1 format
-        result = NumeroCAS(value="64-19-7", confidence=0.9)
-        assert result.value == "64-19-7"
-        
-        # Longer format
-        result = NumeroCAS(value="1234567-89-0", confidence=0.9)
-        assert result.value == "1234567-89-0"
-        
-        # Shorter format
-        result = NumeroCAS(value="50-00-0", confidence=0.9)
-        assert result.value == "50-00-0"
+        result = NumeroCAS(value=cas_value, confidence=0.9)
+        assert result.value == cas_value
 
     def test_special_values(self) -> None:
         """Test that special values are allowed."""
@@ -100,24 +148,24 @@ class TestNumeroCASValidator:
         with pytest.raises(ValidationError, match="formato"):
             NumeroCAS(value="64-19-77", confidence=0.9)
 
+    def test_scan_matches_pattern(self) -> None:
+        """Test the CAS character scan accepts exactly what CAS_PATTERN does."""
+        values = [
+            "64-17-5", "1234567-89-0", "12345678-89-0", "6-17-5", "64-1-7",
+            "64-17-55", "64-17", "64-17-5-1", "", "--", "a4-17-5", "¹²-17-5",
+        ]
+
+        for value in values:
+            assert validator._is_cas(value) == bool(NumeroCAS.CAS_PATTERN.match(value))
+
 class TestClassificacaoONUValidator:
     """Test suite for UN classification validation."""
 
-    def test_valid_classes(self) -> None:
+    @pytest.mark.parametrize("class_value", _VALID_CLASSES)
+    def test_valid_classes(self, class_value: str) -> None:
         """Test all valid UN classes."""
-        valid_classes = [
-            "1", "1.1", "1.2", "1.3", "1.4", "1.5", "1.6",
-            "2.1", "2.2", "2.3",
-            "3",
-            "4.1", "4.2", "4.3",
-            "5.1", "5.2",
-            "6.1", "6.2",
-            "7", "8", "9"
-        ]
-        
-        for class_value in valid_classes:
-            result = ClassificacaoONU(value=class_value, confidence=0.9)
-            assert result.value == class_value
+        result = ClassificacaoONU(value=class_value, confidence=0.9)
+        assert result.value == class_value
 
     def test_extraction_from_text(self) -> None:
         """Test that numeric part is extracted from text."""
@@ -127,6 +175,10 @@ class TestClassificacaoONUValidator:
         result = ClassificacaoONU(value="2.3 - Gases tóxicos", confidence=0.85)
         assert result.value == "2.3"
 
+        # A trailing dot is not part of the label
+        result = ClassificacaoONU(value="Classe 8.", confidence=0.85)
+        assert result.value == "8"
+
     def test_special_values(self) -> None:
         """Test special values are allowed."""
         result = ClassificacaoONU(value="NAO ENCONTRADO", confidence=0.0)
@@ -185,15 +237,117 @@ class TestValidateField:
         assert status == "not_validated"
         assert message is None
 
-    def test_all_field_types(self) -> None:
+    @pytest.mark.parametrize(("field_name", "payload"), _VALID_FIELD_PAYLOADS)
+    def test_all_field_types(self, field_name: str, payload: dict[str, object]) -> None:
         """Test validation works for all field types."""
-        test_cases = [
+        status, message = validate_field(field_name, payload)
+        assert status == "valid"
+        assert message is None
+
+    def test_text_field_types(self) -> None:
+        """Test validation of product, manufacturer and packing group fields."""
+        status, message = validate_field("nome_produto", {"value": "ETANOL 95%", "confidence": 0.95})
+        assert status == "valid"
+        assert message is None
+
+        status, message = validate_field("grupo_embalagem", {"value": "ii", "confidence": 0.8})
+        assert status == "warning"
+        assert message is None
+
+        status, message = validate_field("fabricante", {"value": "AB", "confidence": 0.95})
+        assert status == "invalid"
+        assert "muito curto" in message
+
+    def test_text_field_confidence_bounds(self) -> None:
+        """Test confidence outside 0..1 is rejected for text fields."""
+        status, message = validate_field("nome_produto", {"value": "ETANOL", "confidence": 1.5})
+        assert status == "invalid"
+        assert message is not None
+
+    @pytest.mark.parametrize("confidence", [0.95, "0.95", True, 1.5, None])
+    def test_text_field_message_ignores_confidence_type(self, confidence: object) -> None:
+        """Test a value error reads the same whatever confidence accompanies it."""
+        payload = {"value": "AB"}
+        if confidence is not None:
+            payload["confidence"] = confidence
+
+        assert validate_field("fabricante", payload) == (
+            "invalid", "Nome do fabricante muito curto.",
+        )
+
+    def test_text_field_coerced_confidence_bounds(self) -> None:
+        """Test out-of-range coerced confidence gets the fast-path message."""
+        assert validate_field("nome_produto", {"value": "ETANOL", "confidence": "1.5"}) == (
+            "invalid", "Confianca deve estar entre 0 e 1.",
+        )
+
+    def test_identifier_field_messages(self) -> None:
+        """Test ONU, CAS and class failures report the validator message."""
+        cases = [
+            ("numero_onu", "123", "Numero ONU deve conter 4 digitos."),
+            ("numero_onu", "9999", "Numero ONU fora do intervalo valido."),
+            ("numero_cas", "64-1-7", "Numero CAS deve seguir o formato ####-##-#."),
+            ("classificacao_onu", "Classe 0", "Classe ONU invalida."),
+        ]
+
+        for field_name, value, expected in cases:
+            # Coerced confidence goes through pydantic; the message must not change
+            for confidence in (0.95, "0.95"):
+                status, message = validate_field(
+                    field_name, {"value": value, "confidence": confidence}
+                )
+                assert status == "invalid"
+                assert message == expected
+
+        # The value error wins over an out-of-range confidence
+        assert validate_field("numero_onu", {"value": "0003", "confidence": 1.5}) == (
+            "invalid", "Numero ONU fora do intervalo valido.",
+        )
+
+    def test_coerced_confidence(self) -> None:
+        """Test confidence given as a numeric string is graded after coercion."""
+        status, message = validate_field("numero_onu", {"value": "1234", "confidence": "0.95"})
+        assert status == "valid"
+        assert message is None
+
+    def test_repeated_values_are_cached(self) -> None:
+        """Test repeated well-typed payloads reuse the memoized grade."""
+        validator._try_validate_cached.cache_clear()
+        payload = {"value": "1234", "confidence": 0.95}
+
+        first = validate_field("numero_onu", payload)
+        second = validate_field("numero_onu", dict(payload))
+
+        assert first == second == ("valid", None)
+        assert validator._try_validate_cached.cache_info().hits == 1
+        # Confidence is keyed exactly, not rounded across a threshold
+        assert validate_field("numero_onu", {"value": "1234", "confidence": 0.899}) == (
+            "warning", None,
+        )
+
+    def test_validate_field_many(self) -> None:
+        """Test batch validation matches per-field validation, in order."""
+        items = [
             ("numero_onu", {"value": "1234", "confidence": 0.95}),
-            ("numero_cas", {"value": "64-19-7", "confidence": 0.95}),
-            ("classificacao_onu", {"value": "3", "confidence": 0.95}),
+            ("numero_cas", {"value": "64-1-7", "confidence": 0.95}),
+            ("grupo_embalagem", {"value": "II", "confidence": 0.8}),
+            ("classificacao_onu", {"value": "3", "confidence": 0.5}),
+            ("unknown_field", {"value": "test", "confidence": 0.95}),
         ]
-        
-        for field_name, payload in test_cases:
-            status, message = validate_field(field_name, payload)
-            assert status == "valid"
-            assert message is None
+
+        results = validate_field_many(items)
+
+        assert results == [validate_field(name, payload) for name, payload in items]
+        assert [status for status, _ in results] == [
+            "valid", "invalid", "warning", "invalid", "not_validated",
+        ]
+        assert validate_field_many([]) == []
+
+class TestCompiledBuild:
+    """Test suite for the optional Cython build of the validator."""
+
+    @pytest.mark.skipif(os.getenv("CYTHONIZE") != "1", reason="compiled validator not built")
+    def test_compiled_module_is_imported(self) -> None:
+        """Test that a CYTHONIZE=1 build replaces src.core.validator in place."""
+        assert validator.__name__ == "src.core.validator"
+        assert validator.__file__.endswith(tuple(EXTENSION_SUFFIXES))